@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import json
@@ -37,6 +37,10 @@ except json.JSONDecodeError:
         "GOOGLE_CREDENTIALS must be a JSON service account object (starting with '{'). "
         "Re-check the Secret value and paste the full JSON.")
 
+# Local append-only match log (JSON Lines), flushed to the sheet in batches
+match_log_path = os.getenv("MATCH_LOG_PATH", "match_log.jsonl")
+match_cursor_path = match_log_path + ".flushed"
+
 
 def get_sheet():
     """Connect to Google Sheets"""
@@ -57,11 +61,160 @@ def is_mod():
     return commands.check(predicate)
 
 
+# ============ MATCH LOG ============
+
+MATCH_LOG_HEADER = [
+    'Match #', 'Date', 'Brand', 'Winners', 'Winner Team', 'Losers',
+    'Loser Team', 'Title Match'
+]
+
+match_log = []  # Every logged match, in order (match id == position + 1)
+match_log_flushed = 0  # How many matches have been written to the sheet
+match_records = {'wrestlers': {}, 'teams': {}}  # name -> [wins, losses]
+
+# Wrestler -> team lookup, cached so logging a match doesn't re-read rosters.
+# Reset to None whenever a roster changes.
+team_lookup = None
+
+
+def get_team_lookup():
+    """Map each rostered wrestler to their team (one batched read)"""
+    global team_lookup
+    if team_lookup is None:
+        teams = ['Austin', 'Devin', 'Pacelli']
+        sheet = get_sheet()
+        result = sheet.values_batch_get(
+            [f"'{team} Roster'!A2:A100" for team in teams])
+
+        lookup = {}
+        for team, value_range in zip(teams, result.get('valueRanges', [])):
+            for row in value_range.get('values', []):
+                if row and row[0]:
+                    lookup[row[0].upper()] = team
+        team_lookup = lookup
+    return team_lookup
+
+
+def apply_match_to_records(entry):
+    """Update the in-memory win/loss records with one match"""
+    wrestlers = match_records['wrestlers']
+    for name in entry['winners']:
+        wrestlers.setdefault(name, [0, 0])[0] += 1
+    for name in entry['losers']:
+        wrestlers.setdefault(name, [0, 0])[1] += 1
+
+    # A team only gets a result if it was on one side of the match
+    winner_teams = {team for team in entry['winner_teams'] if team}
+    loser_teams = {team for team in entry['loser_teams'] if team}
+    teams = match_records['teams']
+    for team in winner_teams - loser_teams:
+        teams.setdefault(team, [0, 0])[0] += 1
+    for team in loser_teams - winner_teams:
+        teams.setdefault(team, [0, 0])[1] += 1
+
+
+def load_match_log():
+    """Replay the local match log to rebuild records and the flush cursor"""
+    global match_log_flushed
+    if os.path.exists(match_log_path):
+        with open(match_log_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a partial last line
+                    print(f"Skipping corrupt match log line: {line[:80]}")
+                    continue
+                match_log.append(entry)
+                apply_match_to_records(entry)
+
+    if os.path.exists(match_cursor_path):
+        with open(match_cursor_path, encoding='utf-8') as f:
+            content = f.read().strip()
+        if content.isdigit():
+            match_log_flushed = min(int(content), len(match_log))
+
+
+def append_match(entry):
+    """Durably append one match to the local log and update records"""
+    with open(match_log_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    match_log.append(entry)
+    apply_match_to_records(entry)
+
+
+def save_flush_cursor(count):
+    """Record how many matches have reached the sheet"""
+    tmp_path = match_cursor_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(str(count))
+    os.replace(tmp_path, match_cursor_path)
+
+
+def match_log_row(entry):
+    """Convert a match log entry into a 'Match Log' worksheet row"""
+    return [
+        str(entry['id']), entry['date'], entry['brand'],
+        ', '.join(entry['winners']),
+        ', '.join(dict.fromkeys(t for t in entry['winner_teams'] if t)),
+        ', '.join(entry['losers']),
+        ', '.join(dict.fromkeys(t for t in entry['loser_teams'] if t)),
+        'Yes' if entry['title_match'] else 'No'
+    ]
+
+
+def append_match_log_rows(rows):
+    """Write a batch of rows to the 'Match Log' worksheet (blocking)"""
+    sheet = get_sheet()
+    try:
+        match_sheet = sheet.worksheet('Match Log')
+    except gspread.WorksheetNotFound:
+        match_sheet = sheet.add_worksheet(title='Match Log',
+                                          rows=1000,
+                                          cols=len(MATCH_LOG_HEADER))
+        match_sheet.append_row(MATCH_LOG_HEADER)
+
+    match_sheet.append_rows(rows)
+
+
+@tasks.loop(seconds=30)
+async def flush_match_log():
+    """Push any unflushed matches to the sheet in a single batch"""
+    global match_log_flushed
+    pending = match_log[match_log_flushed:]
+    if not pending:
+        return
+
+    rows = [match_log_row(entry) for entry in pending]
+    try:
+        # gspread is blocking, so keep it off the event loop
+        await bot.loop.run_in_executor(None, append_match_log_rows, rows)
+    except Exception as e:
+        import traceback
+        print(f"\n========== MATCH LOG FLUSH ERROR ==========")
+        print(f"Failed to flush {len(rows)} matches: {type(e).__name__}: {str(e)}")
+        traceback.print_exc()
+        print(f"====================================\n")
+        return
+
+    match_log_flushed += len(pending)
+    save_flush_cursor(match_log_flushed)
+
+
 @bot.event
 async def on_ready():
     print(f'{bot.user} has connected to Discord!')
     print(f'Bot is in {len(bot.guilds)} server(s)')
 
+    # on_ready can fire again after a reconnect
+    if not flush_match_log.is_running():
+        flush_match_log.start()
+
 
 # ============ VIEW COMMANDS (Everyone can use) ============
 
@@ -322,6 +475,51 @@ async def stats(ctx, *, wrestler_name: str):
         print(f"====================================\n")
 
 
+@bot.command(
+    name='record',
+    help='Shows a wrestler\'s or team\'s win/loss record. Usage: !record austin'
+)
+async def record(ctx, *, name: str):
+    """Display win/loss records from the match log"""
+    try:
+        team = name.lower().capitalize()
+
+        if team in ['Austin', 'Devin', 'Pacelli']:
+            wins, losses = match_records['teams'].get(team, [0, 0])
+            await ctx.send(f"**{team.upper()}** - {wins}W / {losses}L")
+            return
+
+        # Case-insensitive partial match, same as !stats
+        matches = [(wrestler, result)
+                   for wrestler, result in match_records['wrestlers'].items()
+                   if name.lower() in wrestler.lower()]
+
+        if not matches:
+            await ctx.send(f"No matches logged for '{name}'")
+            return
+
+        embed = discord.Embed(title=f"{name.upper()} - Win/Loss Record",
+                              color=discord.Color.orange(),
+                              timestamp=datetime.utcnow())
+
+        lines = [
+            f"**{wrestler}** - {wins}W / {losses}L"
+            for wrestler, (wins, losses) in sorted(matches)[:25]
+        ]
+        embed.description = "\n".join(lines)
+
+        await ctx.send(embed=embed)
+
+    except Exception as e:
+        import traceback
+        error_msg = f"Error retrieving record: {type(e).__name__}: {str(e)}"
+        await ctx.send(error_msg)
+        print(f"\n========== RECORD ERROR ==========")
+        print(error_msg)
+        traceback.print_exc()
+        print(f"====================================\n")
+
+
 # ============ MOD COMMANDS (WWE League role required) ============
 
 
@@ -410,6 +608,68 @@ async def newchamp(ctx, title: str, winner: str, team: str):
         print(f"====================================\n")
 
 
+@bot.command(
+    name='match',
+    help=
+    'Logs a match result. Usage: !match raw "JEY USO, JIMMY USO" "THE JUDGMENT DAY" title'
+)
+@is_mod()
+async def match(ctx, brand: str, winners: str, losers: str, title: str = ""):
+    """Record a match result in the local match log"""
+    try:
+        brand = brand.upper()
+        title_match = title.lower() == 'title'
+
+        if brand not in ['RAW', 'SMACKDOWN', 'NXT']:
+            await ctx.send("❌ Invalid brand! Use: raw, smackdown, or nxt")
+            return
+
+        if title and not title_match:
+            await ctx.send("❌ Use 'title' as the last argument for title matches")
+            return
+
+        # Tag teams and multi-person sides are comma separated
+        winner_names = [w.strip().upper() for w in winners.split(',') if w.strip()]
+        loser_names = [l.strip().upper() for l in losers.split(',') if l.strip()]
+
+        if not winner_names or not loser_names:
+            await ctx.send("❌ A match needs at least one winner and one loser")
+            return
+
+        try:
+            lookup = get_team_lookup()
+        except Exception as e:
+            # Still log the match; it just won't count towards team records
+            print(f"Team lookup failed, logging without teams: {type(e).__name__}: {str(e)}")
+            lookup = {}
+
+        entry = {
+            'id': len(match_log) + 1,
+            'date': datetime.utcnow().strftime('%Y-%m-%d %H:%M'),
+            'brand': brand,
+            'winners': winner_names,
+            'winner_teams': [lookup.get(w, "") for w in winner_names],
+            'losers': loser_names,
+            'loser_teams': [lookup.get(l, "") for l in loser_names],
+            'title_match': title_match
+        }
+        append_match(entry)
+
+        title_text = " (Title Match)" if title_match else ""
+        await ctx.send(
+            f"✅ Match #{entry['id']} logged{title_text}!\n**Winner:** {', '.join(winner_names)}\n**Loser:** {', '.join(loser_names)}"
+        )
+
+    except Exception as e:
+        import traceback
+        error_msg = f"❌ Error logging match: {type(e).__name__}: {str(e)}"
+        await ctx.send(error_msg)
+        print(f"\n========== MATCH ERROR ==========")
+        print(error_msg)
+        traceback.print_exc()
+        print(f"====================================\n")
+
+
 @bot.command(name='adddays',
              help='Adds days to all championships. Usage: !adddays 5')
 @is_mod()
@@ -454,6 +714,7 @@ async def adddays(ctx, days: int):
 @is_mod()
 async def addwrestler(ctx, name: str, team: str, show: str, gender: str):
     """Add wrestler to a team's roster"""
+    global team_lookup
     try:
         team = team.lower().capitalize()
         show = show.upper()
@@ -485,6 +746,8 @@ async def addwrestler(ctx, name: str, team: str, show: str, gender: str):
         new_row = [name.upper(), show, gender]
         roster_sheet.append_row(new_row)
 
+        team_lookup = None  # Roster changed, rebuild on next match
+
         # Try to remove from free agents if they're there
         try:
             free_agents = sheet.worksheet('NXT Free Agents')
@@ -520,6 +783,7 @@ async def addwrestler(ctx, name: str, team: str, show: str, gender: str):
 @is_mod()
 async def removewrestler(ctx, name: str, team: str):
     """Remove wrestler from a team's roster and add back to free agents"""
+    global team_lookup
     try:
         team = team.lower().capitalize()
 
@@ -542,6 +806,8 @@ async def removewrestler(ctx, name: str, team: str):
                 # Remove from roster
                 roster_sheet.delete_rows(i)
 
+                team_lookup = None  # Roster changed, rebuild on next match
+
                 # Add back to free agents
                 free_agents = sheet.worksheet('NXT Free Agents')
                 free_agents.append_row([wrestler_name, "NXT", gender])
@@ -667,4 +933,5 @@ async def ping(ctx):
 
 
 # Run the bot
+load_match_log()
 bot.run(token)